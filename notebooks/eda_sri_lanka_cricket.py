@@ -6,18 +6,34 @@ It includes visualizations and insights across all formats (Test, ODI, T20) and
 adapts chart titles to the current dataset year range.
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
+import re
 
-# Use non-interactive backend for automated execution
+import pandas as pd
 import matplotlib
-matplotlib.use('Agg')
+import matplotlib.ticker as ticker
+from matplotlib import cm
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
 # Set style for better-looking plots
-plt.style.use('default')
-plt.rcParams['figure.figsize'] = (12, 6)
-plt.rcParams['font.size'] = 10
+matplotlib.rcParams['font.size'] = 10
+
+# Classifies a victory margin such as "5 wickets" or "23 runs"
+MARGIN_KIND_PATTERN = re.compile(r'(wicket|run)', re.IGNORECASE)
+
+# Render straight to an Agg canvas (no pyplot state machine) and reuse a
+# single figure for every chart. Layout comes from tight_layout() alone;
+# saving with bbox_inches='tight' would render every chart a second time.
+CHART_DPI = 150
+FIGURE = Figure()
+FigureCanvasAgg(FIGURE)
+
+
+def new_chart(figsize):
+    """Clear the shared figure, resize it and return fresh axes."""
+    FIGURE.clear()
+    FIGURE.set_size_inches(figsize)
+    return FIGURE.add_subplot(111)
 
 
 def load_data():
@@ -60,6 +76,23 @@ def load_data():
     return df
 
 
+def add_outcome_flags(df):
+    """Precompute per-match outcome flags shared by the analyses below."""
+    winner = df['Winner'].to_numpy()
+    df['_decided'] = df['Winner'].isin(['Sri Lanka', 'Opponent']).to_numpy()
+    df['_sl_win'] = winner == 'Sri Lanka'
+    return df
+
+
+def outcome_totals(df, by):
+    """Return match, win and decided-match totals per group in one pass."""
+    return df.groupby(by).agg(
+        matches=('_sl_win', 'size'),
+        wins=('_sl_win', 'sum'),
+        decided=('_decided', 'sum'),
+    )
+
+
 def plot_matches_per_year(df):
     """Visualize number of matches played per year."""
     print("\n" + "=" * 80)
@@ -68,29 +101,27 @@ def plot_matches_per_year(df):
     
     matches_per_year = df.groupby('Year').size().sort_index()
     
-    plt.figure(figsize=(14, 6))
-    plt.plot(matches_per_year.index, matches_per_year.values, 
-             marker='o', linewidth=2, markersize=6, color='#1f77b4')
-    plt.fill_between(matches_per_year.index, matches_per_year.values, 
-                     alpha=0.3, color='#1f77b4')
+    ax = new_chart((14, 6))
+    ax.plot(matches_per_year.index, matches_per_year.values, 
+            marker='o', linewidth=2, markersize=6, color='#1f77b4')
+    ax.fill_between(matches_per_year.index, matches_per_year.values, 
+                    alpha=0.3, color='#1f77b4', linewidth=0)
     
-    plt.xlabel('Year', fontsize=12, fontweight='bold')
-    plt.ylabel('Number of Matches', fontsize=12, fontweight='bold')
-    plt.title(
+    ax.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Number of Matches', fontsize=12, fontweight='bold')
+    ax.set_title(
         f"Sri Lanka International Cricket Matches Per Year ({matches_per_year.index.min()}-{matches_per_year.index.max()})",
         fontsize=14,
         fontweight='bold',
         pad=20,
     )
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
+    ax.grid(True, alpha=0.3)
+    FIGURE.tight_layout()
     
     # Save figure
-    plt.savefig('../eda_outputs/matches_per_year.png', dpi=300, bbox_inches='tight')
+    FIGURE.savefig('../eda_outputs/matches_per_year.png', dpi=CHART_DPI)
     print("✓ Chart saved: eda_outputs/matches_per_year.png")
     
-    plt.close()  # Close figure instead of showing
-    
     # Insights
     peak_year = matches_per_year.idxmax()
     peak_count = matches_per_year.max()
@@ -100,39 +131,37 @@ def plot_matches_per_year(df):
     print(f"  • Total years covered: {len(matches_per_year)}")
 
 
-def plot_matches_by_format(df):
+def plot_matches_by_format(df, counts):
     """Visualize matches by cricket format."""
     print("\n" + "=" * 80)
     print("2. MATCHES BY FORMAT")
     print("=" * 80)
     
-    format_counts = df['Match_Format'].value_counts()
+    format_counts = counts['Match_Format']
     
-    plt.figure(figsize=(10, 6))
+    ax = new_chart((10, 6))
     colors = ['#2ecc71', '#3498db', '#e74c3c']
-    bars = plt.bar(format_counts.index, format_counts.values, 
-                   color=colors, edgecolor='black', linewidth=1.5)
+    bars = ax.bar(format_counts.index, format_counts.values, 
+                  color=colors, edgecolor='black', linewidth=1.5)
     
     # Add value labels on bars
     for bar in bars:
         height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height,
-                f'{int(height)}',
-                ha='center', va='bottom', fontsize=12, fontweight='bold')
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+               f'{int(height)}',
+               ha='center', va='bottom', fontsize=12, fontweight='bold')
     
-    plt.xlabel('Match Format', fontsize=12, fontweight='bold')
-    plt.ylabel('Number of Matches', fontsize=12, fontweight='bold')
-    plt.title('Distribution of Matches by Format', 
-              fontsize=14, fontweight='bold', pad=20)
-    plt.grid(True, alpha=0.3, axis='y')
-    plt.tight_layout()
+    ax.set_xlabel('Match Format', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Number of Matches', fontsize=12, fontweight='bold')
+    ax.set_title('Distribution of Matches by Format', 
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.grid(True, alpha=0.3, axis='y')
+    FIGURE.tight_layout()
     
     # Save figure
-    plt.savefig('../eda_outputs/matches_by_format.png', dpi=300, bbox_inches='tight')
+    FIGURE.savefig('../eda_outputs/matches_by_format.png', dpi=CHART_DPI)
     print("✓ Chart saved: eda_outputs/matches_by_format.png")
     
-    plt.close()
-    
     # Insights
     print(f"\n📊 Insights:")
     for fmt, count in format_counts.items():
@@ -140,45 +169,42 @@ def plot_matches_by_format(df):
         print(f"  • {fmt}: {count} matches ({percentage:.1f}%)")
 
 
-def plot_match_outcomes(df):
+def plot_match_outcomes(df, counts):
     """Visualize match outcome distribution."""
     print("\n" + "=" * 80)
     print("3. MATCH OUTCOMES")
     print("=" * 80)
     
-    outcome_counts = df['Winner'].value_counts()
+    outcome_counts = counts['Winner']
     
-    plt.figure(figsize=(12, 6))
+    ax = new_chart((12, 6))
     colors = ['#3498db', '#e74c3c', '#95a5a6', '#f39c12', '#9b59b6']
-    bars = plt.bar(outcome_counts.index, outcome_counts.values, 
-                   color=colors[:len(outcome_counts)], 
-                   edgecolor='black', linewidth=1.5)
+    bars = ax.bar(outcome_counts.index, outcome_counts.values, 
+                  color=colors[:len(outcome_counts)], 
+                  edgecolor='black', linewidth=1.5)
     
     # Add value labels
     for bar in bars:
         height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height,
-                f'{int(height)}',
-                ha='center', va='bottom', fontsize=11, fontweight='bold')
-    
-    plt.xlabel('Match Outcome', fontsize=12, fontweight='bold')
-    plt.ylabel('Number of Matches', fontsize=12, fontweight='bold')
-    plt.title('Distribution of Match Outcomes', 
-              fontsize=14, fontweight='bold', pad=20)
-    plt.grid(True, alpha=0.3, axis='y')
-    plt.xticks(rotation=0)
-    plt.tight_layout()
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+               f'{int(height)}',
+               ha='center', va='bottom', fontsize=11, fontweight='bold')
+    
+    ax.set_xlabel('Match Outcome', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Number of Matches', fontsize=12, fontweight='bold')
+    ax.set_title('Distribution of Match Outcomes', 
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.grid(True, alpha=0.3, axis='y')
+    ax.tick_params(axis='x', labelrotation=0)
+    FIGURE.tight_layout()
     
     # Save figure
-    plt.savefig('../eda_outputs/match_outcomes.png', dpi=300, bbox_inches='tight')
+    FIGURE.savefig('../eda_outputs/match_outcomes.png', dpi=CHART_DPI)
     print("✓ Chart saved: eda_outputs/match_outcomes.png")
     
-    plt.close()
-    
     # Calculate win rate
-    decided_matches = df[df['Winner'].isin(['Sri Lanka', 'Opponent'])]
-    sl_wins = len(df[df['Winner'] == 'Sri Lanka'])
-    total_decided = len(decided_matches)
+    sl_wins = int(df['_sl_win'].sum())
+    total_decided = int(df['_decided'].sum())
     win_rate = (sl_wins / total_decided) * 100 if total_decided > 0 else 0
     
     print(f"\n📊 Insights:")
@@ -189,91 +215,87 @@ def plot_match_outcomes(df):
     print(f"  • No Results: {outcome_counts.get('No Result', 0)}")
 
 
-def plot_top_opponents(df):
+def plot_top_opponents(df, counts):
     """Visualize top 10 opponents by match count."""
     print("\n" + "=" * 80)
     print("4. TOP 10 OPPONENTS")
     print("=" * 80)
     
-    top_opponents = df['Opponent'].value_counts().head(10)
+    opponent_stats = outcome_totals(df, 'Opponent').nlargest(10, 'matches')
+    top_opponents = opponent_stats['matches']
     
-    plt.figure(figsize=(12, 7))
-    colors = plt.cm.viridis(range(len(top_opponents)))
-    bars = plt.barh(top_opponents.index, top_opponents.values, 
-                    color=colors, edgecolor='black', linewidth=1.2)
+    ax = new_chart((12, 7))
+    colors = cm.viridis(range(len(top_opponents)))
+    bars = ax.barh(top_opponents.index, top_opponents.values, 
+                   color=colors, edgecolor='black', linewidth=1.2)
     
     # Add value labels
     for i, (bar, value) in enumerate(zip(bars, top_opponents.values)):
-        plt.text(value, bar.get_y() + bar.get_height()/2, 
-                f' {int(value)}',
-                ha='left', va='center', fontsize=10, fontweight='bold')
-    
-    plt.xlabel('Number of Matches', fontsize=12, fontweight='bold')
-    plt.ylabel('Opponent Team', fontsize=12, fontweight='bold')
-    plt.title('Top 10 Opponents by Match Count', 
-              fontsize=14, fontweight='bold', pad=20)
-    plt.grid(True, alpha=0.3, axis='x')
-    plt.gca().invert_yaxis()  # Highest at top
-    plt.tight_layout()
+        ax.text(value, bar.get_y() + bar.get_height()/2, 
+               f' {int(value)}',
+               ha='left', va='center', fontsize=10, fontweight='bold')
+    
+    ax.set_xlabel('Number of Matches', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Opponent Team', fontsize=12, fontweight='bold')
+    ax.set_title('Top 10 Opponents by Match Count', 
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.grid(True, alpha=0.3, axis='x')
+    ax.invert_yaxis()  # Highest at top
+    FIGURE.tight_layout()
     
     # Save figure
-    plt.savefig('../eda_outputs/top_opponents.png', dpi=300, bbox_inches='tight')
+    FIGURE.savefig('../eda_outputs/top_opponents.png', dpi=CHART_DPI)
     print("✓ Chart saved: eda_outputs/top_opponents.png")
     
-    plt.close()
-    
     # Insights
     print(f"\n📊 Insights:")
     print(f"  • Most played opponent: {top_opponents.index[0]} ({top_opponents.values[0]} matches)")
-    print(f"  • Total unique opponents: {df['Opponent'].nunique()}")
+    print(f"  • Total unique opponents: {len(counts['Opponent'])}")
     
     # Win rate against top opponent
-    top_opp = top_opponents.index[0]
-    top_opp_matches = df[df['Opponent'] == top_opp]
-    top_opp_wins = len(top_opp_matches[top_opp_matches['Winner'] == 'Sri Lanka'])
-    top_opp_total = len(top_opp_matches[top_opp_matches['Winner'].isin(['Sri Lanka', 'Opponent'])])
+    top_opp = opponent_stats.index[0]
+    top_opp_wins = opponent_stats['wins'].iloc[0]
+    top_opp_total = opponent_stats['decided'].iloc[0]
     if top_opp_total > 0:
         top_opp_win_rate = (top_opp_wins / top_opp_total) * 100
         print(f"  • Win rate vs {top_opp}: {top_opp_win_rate:.1f}%")
 
 
-def plot_top_grounds(df):
+def plot_top_grounds(df, counts):
     """Visualize top 10 grounds by match count."""
     print("\n" + "=" * 80)
     print("5. TOP 10 MATCH VENUES")
     print("=" * 80)
     
-    top_grounds = df['Ground'].value_counts().head(10)
+    top_grounds = counts['Ground'].head(10)
     
-    plt.figure(figsize=(12, 7))
-    colors = plt.cm.plasma(range(len(top_grounds)))
-    bars = plt.barh(top_grounds.index, top_grounds.values, 
-                    color=colors, edgecolor='black', linewidth=1.2)
+    ax = new_chart((12, 7))
+    colors = cm.plasma(range(len(top_grounds)))
+    bars = ax.barh(top_grounds.index, top_grounds.values, 
+                   color=colors, edgecolor='black', linewidth=1.2)
     
     # Add value labels
     for i, (bar, value) in enumerate(zip(bars, top_grounds.values)):
-        plt.text(value, bar.get_y() + bar.get_height()/2, 
-                f' {int(value)}',
-                ha='left', va='center', fontsize=10, fontweight='bold')
-    
-    plt.xlabel('Number of Matches', fontsize=12, fontweight='bold')
-    plt.ylabel('Ground/Venue', fontsize=12, fontweight='bold')
-    plt.title('Top 10 Match Venues by Match Count', 
-              fontsize=14, fontweight='bold', pad=20)
-    plt.grid(True, alpha=0.3, axis='x')
-    plt.gca().invert_yaxis()
-    plt.tight_layout()
+        ax.text(value, bar.get_y() + bar.get_height()/2, 
+               f' {int(value)}',
+               ha='left', va='center', fontsize=10, fontweight='bold')
+    
+    ax.set_xlabel('Number of Matches', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Ground/Venue', fontsize=12, fontweight='bold')
+    ax.set_title('Top 10 Match Venues by Match Count', 
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.grid(True, alpha=0.3, axis='x')
+    ax.invert_yaxis()
+    FIGURE.tight_layout()
     
     # Save figure
-    plt.savefig('../eda_outputs/top_grounds.png', dpi=300, bbox_inches='tight')
+    FIGURE.savefig('../eda_outputs/top_grounds.png', dpi=CHART_DPI)
     print("✓ Chart saved: eda_outputs/top_grounds.png")
     
-    plt.close()
-    
     # Insights
     print(f"\n📊 Insights:")
     print(f"  • Most frequent venue: {top_grounds.index[0]} ({top_grounds.values[0]} matches)")
-    print(f"  • Total unique venues: {df['Ground'].nunique()}")
+    print(f"  • Total unique venues: {len(counts['Ground'])}")
 
 
 def analyze_home_away_performance(df):
@@ -282,94 +304,86 @@ def analyze_home_away_performance(df):
     print("6. HOME VS AWAY PERFORMANCE")
     print("=" * 80)
     
+    formats = ['Test', 'ODI', 'T20']
+    locations = ['Home', 'Away']
+    by_format = outcome_totals(df, ['Match_Format', 'Home_Away']).reindex(
+        pd.MultiIndex.from_product([formats, locations]), fill_value=0
+    )
+    by_location = outcome_totals(df, 'Home_Away').reindex(locations, fill_value=0)
+    
     # Overall distribution
     print("\n📊 Overall Distribution:")
-    home_count = len(df[df['Home_Away'] == 'Home'])
-    away_count = len(df[df['Home_Away'] == 'Away'])
+    home_count = by_location.loc['Home', 'matches']
+    away_count = by_location.loc['Away', 'matches']
     total = len(df)
     print(f"  • Home matches: {home_count} ({home_count/total*100:.1f}%)")
     print(f"  • Away matches: {away_count} ({away_count/total*100:.1f}%)")
     
     # Home performance
     print("\n🏠 Home Performance:")
-    home = df[df['Home_Away'] == 'Home']
-    home_decisive = home[home['Winner'].isin(['Sri Lanka', 'Opponent'])]
-    home_wins = len(home[home['Winner'] == 'Sri Lanka'])
-    home_losses = len(home[home['Winner'] == 'Opponent'])
+    home_matches, home_wins, home_decisive = by_location.loc['Home', ['matches', 'wins', 'decided']]
     print(f"  • Wins: {home_wins}")
-    print(f"  • Losses: {home_losses}")
-    print(f"  • Other (Draw/Tie/No Result): {len(home) - len(home_decisive)}")
-    if len(home_decisive) > 0:
-        print(f"  • Win rate: {home_wins/len(home_decisive)*100:.1f}% (of decisive matches)")
+    print(f"  • Losses: {home_decisive - home_wins}")
+    print(f"  • Other (Draw/Tie/No Result): {home_matches - home_decisive}")
+    if home_decisive > 0:
+        print(f"  • Win rate: {home_wins/home_decisive*100:.1f}% (of decisive matches)")
     
     # Away performance
     print("\n✈️ Away Performance:")
-    away = df[df['Home_Away'] == 'Away']
-    away_decisive = away[away['Winner'].isin(['Sri Lanka', 'Opponent'])]
-    away_wins = len(away[away['Winner'] == 'Sri Lanka'])
-    away_losses = len(away[away['Winner'] == 'Opponent'])
+    away_matches, away_wins, away_decisive = by_location.loc['Away', ['matches', 'wins', 'decided']]
     print(f"  • Wins: {away_wins}")
-    print(f"  • Losses: {away_losses}")
-    print(f"  • Other (Draw/Tie/No Result): {len(away) - len(away_decisive)}")
-    if len(away_decisive) > 0:
-        print(f"  • Win rate: {away_wins/len(away_decisive)*100:.1f}% (of decisive matches)")
+    print(f"  • Losses: {away_decisive - away_wins}")
+    print(f"  • Other (Draw/Tie/No Result): {away_matches - away_decisive}")
+    if away_decisive > 0:
+        print(f"  • Win rate: {away_wins/away_decisive*100:.1f}% (of decisive matches)")
     
     # By format
     print("\n📈 Performance by Format:")
-    for fmt in ['Test', 'ODI', 'T20']:
-        fmt_df = df[df['Match_Format'] == fmt]
+    for fmt in formats:
         print(f"\n  {fmt}:")
         
-        home_fmt = fmt_df[fmt_df['Home_Away'] == 'Home']
-        away_fmt = fmt_df[fmt_df['Home_Away'] == 'Away']
+        home_fmt = by_format.loc[(fmt, 'Home')]
+        away_fmt = by_format.loc[(fmt, 'Away')]
         
-        print(f"    Home: {len(home_fmt)} matches")
-        print(f"    Away: {len(away_fmt)} matches")
+        print(f"    Home: {home_fmt['matches']} matches")
+        print(f"    Away: {away_fmt['matches']} matches")
         
         # Win rates
-        home_fmt_decisive = home_fmt[home_fmt['Winner'].isin(['Sri Lanka', 'Opponent'])]
-        away_fmt_decisive = away_fmt[away_fmt['Winner'].isin(['Sri Lanka', 'Opponent'])]
+        if home_fmt['decided'] > 0:
+            print(f"    Home win rate: {home_fmt['wins']/home_fmt['decided']*100:.1f}%")
         
-        if len(home_fmt_decisive) > 0:
-            home_fmt_wins = len(home_fmt[home_fmt['Winner'] == 'Sri Lanka'])
-            print(f"    Home win rate: {home_fmt_wins/len(home_fmt_decisive)*100:.1f}%")
-        
-        if len(away_fmt_decisive) > 0:
-            away_fmt_wins = len(away_fmt[away_fmt['Winner'] == 'Sri Lanka'])
-            print(f"    Away win rate: {away_fmt_wins/len(away_fmt_decisive)*100:.1f}%")
+        if away_fmt['decided'] > 0:
+            print(f"    Away win rate: {away_fmt['wins']/away_fmt['decided']*100:.1f}%")
     
     # Create visualization comparing home vs away win rates
-    plt.figure(figsize=(10, 6))
+    ax = new_chart((10, 6))
     
     # Prepare data
-    home_win_rate = home_wins/len(home_decisive)*100 if len(home_decisive) > 0 else 0
-    away_win_rate = away_wins/len(away_decisive)*100 if len(away_decisive) > 0 else 0
+    home_win_rate = home_wins/home_decisive*100 if home_decisive > 0 else 0
+    away_win_rate = away_wins/away_decisive*100 if away_decisive > 0 else 0
     
-    locations = ['Home', 'Away']
     win_rates = [home_win_rate, away_win_rate]
     colors = ['#2ecc71', '#e74c3c']
     
-    bars = plt.bar(locations, win_rates, color=colors, alpha=0.7, edgecolor='black', linewidth=1.5)
+    bars = ax.bar(locations, win_rates, color=colors, alpha=0.7, edgecolor='black', linewidth=1.5)
     
     # Add value labels on bars
     for bar in bars:
         height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height,
-                f'{height:.1f}%',
-                ha='center', va='bottom', fontsize=12, fontweight='bold')
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+               f'{height:.1f}%',
+               ha='center', va='bottom', fontsize=12, fontweight='bold')
     
-    plt.ylabel('Win Rate (%)', fontsize=12, fontweight='bold')
-    plt.title('Sri Lanka Win Rate: Home vs Away', 
-              fontsize=14, fontweight='bold', pad=20)
-    plt.ylim(0, max(win_rates) * 1.2)
-    plt.grid(True, alpha=0.3, axis='y')
-    plt.tight_layout()
+    ax.set_ylabel('Win Rate (%)', fontsize=12, fontweight='bold')
+    ax.set_title('Sri Lanka Win Rate: Home vs Away', 
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.set_ylim(0, max(win_rates) * 1.2)
+    ax.grid(True, alpha=0.3, axis='y')
+    FIGURE.tight_layout()
     
     # Save figure
-    plt.savefig('../eda_outputs/home_away_performance.png', dpi=300, bbox_inches='tight')
+    FIGURE.savefig('../eda_outputs/home_away_performance.png', dpi=CHART_DPI)
     print("\n✓ Chart saved: eda_outputs/home_away_performance.png")
-    
-    plt.close()
 
 
 def analyze_format_performance(df):
@@ -378,21 +392,22 @@ def analyze_format_performance(df):
     print("7. PERFORMANCE BY FORMAT")
     print("=" * 80)
     
+    by_format = outcome_totals(df, 'Match_Format')
+    
     for fmt in ['Test', 'ODI', 'T20']:
-        fmt_df = df[df['Match_Format'] == fmt]
-        decided = fmt_df[fmt_df['Winner'].isin(['Sri Lanka', 'Opponent'])]
-        wins = len(fmt_df[fmt_df['Winner'] == 'Sri Lanka'])
-        total = len(decided)
+        if fmt not in by_format.index:
+            continue
+        matches, wins, total = by_format.loc[fmt, ['matches', 'wins', 'decided']]
         
         if total > 0:
             win_rate = (wins / total) * 100
             print(f"\n{fmt} Cricket:")
-            print(f"  • Total matches: {len(fmt_df)}")
+            print(f"  • Total matches: {matches}")
             print(f"  • Wins: {wins}")
             print(f"  • Win rate: {win_rate:.1f}%")
 
 
-def generate_summary_statistics(df):
+def generate_summary_statistics(df, counts):
     """Generate overall summary statistics."""
     print("\n" + "=" * 80)
     print("8. SUMMARY STATISTICS")
@@ -403,35 +418,44 @@ def generate_summary_statistics(df):
     print(f"  • Date range: {df['Match_Date'].min()} to {df['Match_Date'].max()}")
     print(f"  • Years covered: {df['Year'].nunique()}")
     print(f"  • Formats: {', '.join(df['Match_Format'].unique())}")
-    print(f"  • Unique opponents: {df['Opponent'].nunique()}")
-    print(f"  • Unique venues: {df['Ground'].nunique()}")
+    print(f"  • Unique opponents: {len(counts['Opponent'])}")
+    print(f"  • Unique venues: {len(counts['Ground'])}")
     
     # Margin analysis
     print(f"\n🎯 Victory Margins:")
     margins_with_data = df[df['Margin'] != '']
     print(f"  • Matches with margin data: {len(margins_with_data)}")
     
-    wicket_margins = margins_with_data[margins_with_data['Margin'].str.contains('wicket', case=False, na=False)]
-    run_margins = margins_with_data[margins_with_data['Margin'].str.contains('run', case=False, na=False)]
+    # Classify each margin as wickets or runs in a single pass over the column
+    margin_kinds = margins_with_data['Margin'].str.extract(
+        MARGIN_KIND_PATTERN, expand=False
+    ).str.lower().value_counts()
     
-    print(f"  • Wins by wickets: {len(wicket_margins)}")
-    print(f"  • Wins by runs: {len(run_margins)}")
+    print(f"  • Wins by wickets: {margin_kinds.get('wicket', 0)}")
+    print(f"  • Wins by runs: {margin_kinds.get('run', 0)}")
 
 
 def main():
     """Main EDA execution function."""
     # Load data
     df = load_data()
+    df = add_outcome_flags(df)
+    
+    # Value counts shared by several charts and the summary, computed once
+    counts = {
+        col: df[col].value_counts()
+        for col in ['Match_Format', 'Winner', 'Opponent', 'Ground']
+    }
     
     # Generate all visualizations and analyses
     plot_matches_per_year(df)
-    plot_matches_by_format(df)
-    plot_match_outcomes(df)
-    plot_top_opponents(df)
-    plot_top_grounds(df)
+    plot_matches_by_format(df, counts)
+    plot_match_outcomes(df, counts)
+    plot_top_opponents(df, counts)
+    plot_top_grounds(df, counts)
     analyze_home_away_performance(df)
     analyze_format_performance(df)
-    generate_summary_statistics(df)
+    generate_summary_statistics(df, counts)
     
     print("\n" + "=" * 80)
     print("✓ EDA Complete! All visualizations saved.")
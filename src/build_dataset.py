@@ -5,12 +5,15 @@ This module downloads Cricsheet data (Tests, ODIs, T20s) and generates
 a clean CSV dataset of Sri Lanka's international cricket matches from 2000 onwards.
 """
 
+import functools
 import json
+import multiprocessing
 import os
+import re
 import zipfile
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import logging
 
 import pandas as pd
@@ -33,11 +36,41 @@ CRICSHEET_URLS = {
     't20s': 'https://cricsheet.org/downloads/t20s_json.zip'
 }
 
+# Shared HTTP session so the format archives reuse one keep-alive connection
+SESSION = requests.Session()
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
 # Output configuration
 OUTPUT_CSV = 'sri_lanka_international_cricket_matches_2000_present.csv'
+OUTPUT_COLUMNS = [
+    'Match_Date', 'Match_Format', 'Opponent', 'Winner', 'Margin', 'Ground', 'Year',
+    'Gender', 'Toss_Winner', 'Toss_Decision', 'Player_of_Match', 'Event_Name'
+]
+# Compact dtypes for the low-cardinality and numeric output columns
+OUTPUT_DTYPES = {
+    'Year': 'int16',
+    'Match_Format': 'category',
+    'Opponent': 'category',
+    'Winner': 'category',
+    'Ground': 'category',
+}
 TEMP_DIR = Path('temp')
 START_YEAR = 2000
 
+# Number of match files handed to each worker process at a time
+PARSE_CHUNK_SIZE = 256
+
+# Team name spellings that identify a Sri Lanka fixture
+SRI_LANKA_TEAMS = frozenset({'Sri Lanka', 'SL', 'sri lanka'})
+SRI_LANKA_MARKERS = tuple(name.encode('utf-8') for name in SRI_LANKA_TEAMS)
+
+# Date formats accepted in Cricsheet match info, tried in order
+DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%d/%m/%Y')
+
+# Cricsheet files place "info" ahead of the (much larger) ball-by-ball "innings"
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+JSON_DECODER = json.JSONDecoder()
+
 
 def download_file(url: str, destination: Path) -> bool:
     """
@@ -52,7 +85,7 @@ def download_file(url: str, destination: Path) -> bool:
     """
     try:
         logger.info(f"Downloading {url}")
-        response = requests.get(url, stream=True, timeout=60)
+        response = SESSION.get(url, stream=True, timeout=60)
         response.raise_for_status()
         
         total_size = int(response.headers.get('content-length', 0))
@@ -64,7 +97,7 @@ def download_file(url: str, destination: Path) -> bool:
             unit_scale=True,
             unit_divisor=1024,
         ) as progress_bar:
-            for chunk in response.iter_content(chunk_size=8192):
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
                 size = f.write(chunk)
                 progress_bar.update(size)
         
@@ -123,7 +156,7 @@ def parse_match_date(match_data: Dict) -> Optional[str]:
         date_str = dates[0]  # Use first date
         
         # Parse various date formats
-        for fmt in ['%Y-%m-%d', '%Y/%m/%d', '%d/%m/%Y']:
+        for fmt in DATE_FORMATS:
             try:
                 date_obj = datetime.strptime(date_str, fmt)
                 return date_obj.strftime('%Y-%m-%d')
@@ -235,7 +268,46 @@ def get_margin(match_data: Dict) -> str:
         return ''
 
 
-def parse_match_json(json_path: Path, match_format: str) -> Optional[Dict]:
+def load_match_info(raw: bytes) -> Dict:
+    """
+    Decode only the top-level info object of a Cricsheet match file.
+    
+    Args:
+        raw: Raw bytes of the match JSON file
+        
+    Returns:
+        The match info dictionary
+    """
+    text = raw.decode('utf-8')
+    
+    # Walk the top-level members in order and stop at "info", so the
+    # innings data that follows it is never decoded
+    try:
+        pos = JSON_WHITESPACE.match(text).end()
+        if text[pos] == '{':
+            while True:
+                pos = JSON_WHITESPACE.match(text, pos + 1).end()
+                key, pos = JSON_DECODER.raw_decode(text, pos)
+                pos = JSON_WHITESPACE.match(text, pos).end()
+                if text[pos] != ':':
+                    break
+                pos = JSON_WHITESPACE.match(text, pos + 1).end()
+                value, pos = JSON_DECODER.raw_decode(text, pos)
+                if key == 'info':
+                    if isinstance(value, dict):
+                        return value
+                    break
+                pos = JSON_WHITESPACE.match(text, pos).end()
+                if text[pos] != ',':
+                    break
+    except (ValueError, IndexError):
+        pass
+    
+    # Fall back to decoding the whole document
+    return json.loads(text).get('info', {})
+
+
+def parse_match_json(json_path: Union[str, Path], match_format: str) -> Optional[Dict]:
     """
     Parse a single match JSON file.
     
@@ -247,20 +319,25 @@ def parse_match_json(json_path: Path, match_format: str) -> Optional[Dict]:
         Dictionary with parsed match data or None
     """
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            match_data = json.load(f)
+        with open(json_path, 'rb') as f:
+            raw = f.read()
+        
+        # Most files do not involve Sri Lanka; reject them before decoding JSON
+        if not any(marker in raw for marker in SRI_LANKA_MARKERS):
+            return None
+        
+        info = load_match_info(raw)
+        match_data = {'info': info}
         
         # Get basic info
-        info = match_data.get('info', {})
         teams = info.get('teams', [])
         
         # Check if Sri Lanka is involved
-        sri_lanka_variations = ['Sri Lanka', 'SL', 'sri lanka']
         sri_lanka_team = None
         opponent_team = None
         
         for team in teams:
-            if any(sl in team for sl in sri_lanka_variations):
+            if team in SRI_LANKA_TEAMS:
                 sri_lanka_team = team
             else:
                 opponent_team = team
@@ -322,6 +399,25 @@ def parse_match_json(json_path: Path, match_format: str) -> Optional[Dict]:
         return None
 
 
+def parse_match_files(json_paths: List[str], match_format: str) -> List[Dict]:
+    """
+    Parse a batch of match files, keeping only Sri Lanka matches.
+    
+    Args:
+        json_paths: Paths to JSON files
+        match_format: Match format (Test, ODI, T20)
+        
+    Returns:
+        List of parsed match dictionaries
+    """
+    matches = []
+    for json_path in json_paths:
+        match_data = parse_match_json(json_path, match_format)
+        if match_data:
+            matches.append(match_data)
+    return matches
+
+
 def process_format(format_name: str, format_dir: Path) -> List[Dict]:
     """
     Process all matches for a specific format.
@@ -333,15 +429,27 @@ def process_format(format_name: str, format_dir: Path) -> List[Dict]:
     Returns:
         List of parsed match dictionaries
     """
-    matches = []
-    json_files = list(format_dir.glob('*.json'))
+    # scandir yields names without a per-entry stat(), unlike Path.glob
+    with os.scandir(format_dir) as entries:
+        json_files = [entry.path for entry in entries if entry.name.endswith('.json')]
     
     logger.info(f"Processing {len(json_files)} {format_name} matches")
     
-    for json_file in tqdm(json_files, desc=f"Parsing {format_name}"):
-        match_data = parse_match_json(json_file, format_name)
-        if match_data:
-            matches.append(match_data)
+    # Parsing is CPU-bound and independent per file, so fan batches out across
+    # processes; each worker sends back only the matches it kept
+    batches = [
+        json_files[i:i + PARSE_CHUNK_SIZE]
+        for i in range(0, len(json_files), PARSE_CHUNK_SIZE)
+    ]
+    parse = functools.partial(parse_match_files, match_format=format_name)
+    matches = []
+    
+    with multiprocessing.Pool(os.cpu_count()) as pool, tqdm(
+        total=len(json_files), desc=f"Parsing {format_name}"
+    ) as progress_bar:
+        for batch, batch_matches in zip(batches, pool.imap(parse, batches)):
+            matches.extend(batch_matches)
+            progress_bar.update(len(batch))
     
     logger.info(f"Found {len(matches)} Sri Lanka {format_name} matches from {START_YEAR} onwards")
     return matches
@@ -400,14 +508,12 @@ def build_dataset():
     logger.info(f"Creating CSV with {len(all_matches)} total matches")
     logger.info(f"{'=' * 80}")
     
-    df = pd.DataFrame(all_matches)
+    # Build columns in their final order directly, avoiding a reindexing copy
+    df = pd.DataFrame.from_records(all_matches, columns=OUTPUT_COLUMNS).astype(OUTPUT_DTYPES)
     
     # Sort by date
     df = df.sort_values('Match_Date')
     
-    # Ensure column order
-    df = df[['Match_Date', 'Match_Format', 'Opponent', 'Winner', 'Margin', 'Ground', 'Year', 'Gender', 'Toss_Winner', 'Toss_Decision', 'Player_of_Match', 'Event_Name']]
-    
     # Save CSV
     df.to_csv(OUTPUT_CSV, index=False)
     
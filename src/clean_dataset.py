@@ -6,11 +6,13 @@ Kaggle-quality standards. It checks data integrity, removes duplicates,
 standardizes values, and produces a cleaned CSV output.
 """
 
+import argparse
 import logging
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 import re
 
+import numpy as np
 import pandas as pd
 
 
@@ -29,6 +31,22 @@ VALID_WINNERS = ['Sri Lanka', 'Opponent', 'Draw', 'Tie', 'No Result', '']
 INPUT_CSV = 'sri_lanka_international_cricket_matches_2000_present.csv'
 OUTPUT_CSV = 'sri_lanka_international_cricket_matches_2000_present_clean.csv'
 
+# Column dtypes for reading the raw CSV; Match_Date is parsed on load
+INPUT_DTYPES = {
+    'Match_Format': str, 'Opponent': str, 'Winner': str, 'Margin': str,
+    'Ground': str, 'Gender': str, 'Toss_Winner': str, 'Toss_Decision': str,
+    'Player_of_Match': str, 'Event_Name': str
+}
+
+# Sri Lanka team names, lower-cased with whitespace removed
+SRI_LANKA_ALIASES = frozenset({'srilanka', 'sl'})
+
+# Columns identifying a match for duplicate detection
+DUPLICATE_KEY_COLUMNS = ['Match_Date', 'Match_Format', 'Opponent', 'Ground']
+
+# Margins of the form "X run(s)" or "X wicket(s)"
+MARGIN_PATTERN = re.compile(r'^(\d+)\s+(run|runs|wicket|wickets)$', re.IGNORECASE)
+
 # Sri Lankan venue keywords for home/away classification
 SRI_LANKAN_VENUES = [
     'Colombo', 'Galle', 'Kandy', 'Dambulla', 'Kurunegala',
@@ -40,6 +58,22 @@ SRI_LANKAN_VENUES = [
 ]
 
 
+def _minimal_keywords(keywords: List[str]) -> List[str]:
+    """Drop keywords that contain a shorter keyword, as they can never add a match."""
+    folded = sorted({k.lower() for k in keywords}, key=len)
+    kept = []
+    for keyword in folded:
+        if not any(shorter in keyword for shorter in kept):
+            kept.append(keyword)
+    return kept
+
+
+SRI_LANKAN_VENUE_PATTERN = re.compile(
+    '|'.join(re.escape(venue) for venue in _minimal_keywords(SRI_LANKAN_VENUES)),
+    re.IGNORECASE
+)
+
+
 class DataValidator:
     """Validates and cleans cricket match data."""
     
@@ -50,7 +84,9 @@ class DataValidator:
         Args:
             df: Input DataFrame to validate and clean
         """
-        self.df = df.copy()
+        # Shallow copy: columns are only ever replaced, never written in place,
+        # so the caller's frame is left untouched without duplicating its data
+        self.df = df.copy(deep=False)
         self.original_rows = len(df)
         self.issues = {
             'missing_columns': [],
@@ -62,6 +98,8 @@ class DataValidator:
             'duplicates': 0,
             'rows_removed': 0
         }
+        # Per-step counts, logged once in the cleaning summary
+        self.stats = {}
     
     def validate_columns(self) -> bool:
         """
@@ -91,13 +129,13 @@ class DataValidator:
     
     def trim_whitespace(self):
         """Trim whitespace from all string columns."""
-        logger.info("Trimming whitespace from string columns...")
+        logger.debug("Trimming whitespace from string columns...")
         
-        string_cols = self.df.select_dtypes(include=['object']).columns
-        for col in string_cols:
-            self.df[col] = self.df[col].astype(str).str.strip()
+        # Missing values become empty strings rather than the literal 'nan'
+        string_cols = self.df.select_dtypes(include=['object', 'string']).columns
+        self.df[string_cols] = self.df[string_cols].fillna('').astype(str).apply(lambda col: col.str.strip())
         
-        logger.info("✓ Whitespace trimmed")
+        logger.debug("✓ Whitespace trimmed")
     
     def validate_match_format(self) -> int:
         """
@@ -106,7 +144,7 @@ class DataValidator:
         Returns:
             Number of invalid rows found
         """
-        logger.info("Validating Match_Format...")
+        logger.debug("Validating Match_Format...")
         
         # Standardize format names (handle T20I -> T20, etc.)
         format_mapping = {
@@ -116,13 +154,11 @@ class DataValidator:
             'test': 'Test'
         }
         
-        self.df['Match_Format'] = self.df['Match_Format'].astype(str).str.strip()
-        self.df['Match_Format'] = self.df['Match_Format'].str.lower().map(
-            lambda x: format_mapping.get(x, x.title())
-        )
+        lower = self.df['Match_Format'].astype(str).str.strip().str.lower()
+        self.df['Match_Format'] = lower.map(format_mapping).fillna(lower.str.title())
         
         invalid_mask = ~self.df['Match_Format'].isin(VALID_FORMATS)
-        invalid_count = invalid_mask.sum()
+        invalid_count = int(invalid_mask.sum())
         
         if invalid_count > 0:
             invalid_formats = self.df.loc[invalid_mask, 'Match_Format'].unique()
@@ -131,7 +167,10 @@ class DataValidator:
             self.df = self.df[~invalid_mask]
             self.issues['rows_removed'] += invalid_count
         
-        logger.info(f"✓ Match_Format validated ({invalid_count} invalid rows removed)")
+        self.df['Match_Format'] = self.df['Match_Format'].astype('category')
+        
+        self.stats['Invalid formats removed'] = invalid_count
+        logger.debug(f"✓ Match_Format validated ({invalid_count} invalid rows removed)")
         return invalid_count
     
     def validate_winner(self) -> int:
@@ -141,7 +180,7 @@ class DataValidator:
         Returns:
             Number of invalid rows found
         """
-        logger.info("Validating Winner...")
+        logger.debug("Validating Winner...")
         
         # Standardize winner values
         winner_mapping = {
@@ -160,14 +199,12 @@ class DataValidator:
             'nan': ''
         }
         
-        self.df['Winner'] = self.df['Winner'].fillna('').astype(str).str.strip()
-        self.df['Winner'] = self.df['Winner'].str.lower().map(
-            lambda x: winner_mapping.get(x, x)
-        )
+        lower = self.df['Winner'].fillna('').astype(str).str.strip().str.lower()
+        self.df['Winner'] = lower.map(winner_mapping).fillna(lower)
         
         # Check for invalid winners
         invalid_mask = ~self.df['Winner'].isin(VALID_WINNERS)
-        invalid_count = invalid_mask.sum()
+        invalid_count = int(invalid_mask.sum())
         
         if invalid_count > 0:
             invalid_winners = self.df.loc[invalid_mask, 'Winner'].unique()
@@ -175,77 +212,53 @@ class DataValidator:
             self.issues['invalid_winner'] = list(invalid_winners)
             
             # Try to map unknown winners to "Opponent"
-            for idx in self.df[invalid_mask].index:
-                winner = self.df.loc[idx, 'Winner']
-                if winner and winner not in ['', 'nan', 'None']:
-                    self.df.loc[idx, 'Winner'] = 'Opponent'
-                else:
-                    self.df.loc[idx, 'Winner'] = ''
-        
-        logger.info(f"✓ Winner validated ({invalid_count} values standardized)")
+            empty_mask = self.df['Winner'].isin(['', 'nan', 'None'])
+            self.df.loc[invalid_mask & ~empty_mask, 'Winner'] = 'Opponent'
+            self.df.loc[invalid_mask & empty_mask, 'Winner'] = ''
+        
+        self.df['Winner'] = self.df['Winner'].astype('category')
+        
+        self.stats['Winners standardized'] = invalid_count
+        logger.debug(f"✓ Winner validated ({invalid_count} values standardized)")
         return invalid_count
     
-    def validate_date_format(self) -> int:
+    def validate_dates(self) -> int:
         """
-        Validate Match_Date format (YYYY-MM-DD).
+        Validate Match_Date, keep it as datetime64 and derive Year from it.
         
         Returns:
             Number of invalid rows found
         """
-        logger.info("Validating Match_Date format...")
-        # Try to parse dates robustly using pandas. Accept common date formats
-        # and coerce invalid parses to NaT, then drop them.
-        self.df['Match_Date'] = self.df['Match_Date'].astype(str).str.strip()
-
-        # Attempt parsing with pandas. Let pandas infer formats; also try dayfirst=True
-        parsed = pd.to_datetime(self.df['Match_Date'], errors='coerce', infer_datetime_format=True)
-        # If many failed, try alternative with dayfirst=True
-        if parsed.isna().sum() > 0:
-            parsed_alt = pd.to_datetime(self.df['Match_Date'], errors='coerce', dayfirst=True, infer_datetime_format=True)
-            # Use parsed_alt where parsed is NaT
-            parsed = parsed.fillna(parsed_alt)
+        logger.debug("Validating Match_Date and Year...")
+        # Parse dates once, letting pandas infer the format; retry only the
+        # failures as DD/MM/YYYY, then drop rows that still do not parse.
+        if pd.api.types.is_datetime64_any_dtype(self.df['Match_Date']):
+            parsed = self.df['Match_Date']
+        else:
+            dates = self.df['Match_Date'].astype(str).str.strip()
+            parsed = pd.to_datetime(dates, errors='coerce')
+            failed = parsed.isna()
+            if failed.any():
+                parsed = parsed.fillna(pd.to_datetime(dates[failed], format='%d/%m/%Y', errors='coerce'))
 
-        invalid_count = parsed.isna().sum()
+        invalid_mask = parsed.isna()
+        invalid_count = int(invalid_mask.sum())
 
         if invalid_count > 0:
             logger.warning(f"Found {invalid_count} rows with invalid/unparseable dates")
             self.issues['invalid_date'] = invalid_count
-            self.df = self.df[~parsed.isna()].copy()
-            # replace Match_Date with ISO formatted dates
-            self.df['Match_Date'] = pd.to_datetime(self.df['Match_Date'], infer_datetime_format=True).dt.strftime('%Y-%m-%d')
+            self.df = self.df[~invalid_mask].copy()
+            parsed = parsed[~invalid_mask]
             self.issues['rows_removed'] += invalid_count
-        else:
-            # All parsed successfully; normalize to YYYY-MM-DD
-            self.df['Match_Date'] = parsed.dt.strftime('%Y-%m-%d')
 
-        logger.info(f"✓ Match_Date validated ({invalid_count} invalid rows removed)")
+        # Year always follows Match_Date
+        self.df['Match_Date'] = parsed
+        self.df['Year'] = parsed.dt.year.astype(int)
+
+        self.stats['Invalid dates removed'] = invalid_count
+        logger.debug(f"✓ Match_Date and Year validated ({invalid_count} invalid rows removed)")
         return invalid_count
     
-    def validate_year_consistency(self) -> int:
-        """
-        Validate that Year matches Match_Date year.
-        
-        Returns:
-            Number of inconsistent rows fixed
-        """
-        logger.info("Validating Year consistency...")
-        
-        # Extract year from Match_Date
-        self.df['Year'] = pd.to_datetime(self.df['Match_Date'], errors='coerce').dt.year
-        
-        # Check for null years (invalid dates)
-        null_years = self.df['Year'].isna().sum()
-        if null_years > 0:
-            logger.warning(f"Found {null_years} rows with invalid dates")
-            self.df = self.df.dropna(subset=['Year'])
-            self.issues['rows_removed'] += null_years
-        
-        # Convert to integer
-        self.df['Year'] = self.df['Year'].astype(int)
-        
-        logger.info(f"✓ Year consistency validated")
-        return 0
-    
     def validate_opponent(self) -> int:
         """
         Validate that Opponent is never 'Sri Lanka'.
@@ -253,14 +266,14 @@ class DataValidator:
         Returns:
             Number of invalid rows found
         """
-        logger.info("Validating Opponent...")
+        logger.debug("Validating Opponent...")
         
         self.df['Opponent'] = self.df['Opponent'].astype(str).str.strip()
         
-        # Check for Sri Lanka as opponent
-        sri_lanka_variations = ['Sri Lanka', 'sri lanka', 'SriLanka', 'SL']
-        invalid_mask = self.df['Opponent'].isin(sri_lanka_variations)
-        invalid_count = invalid_mask.sum()
+        # Check for Sri Lanka as opponent, ignoring case and spacing
+        folded = self.df['Opponent'].str.lower().str.replace(r'\s+', '', regex=True)
+        invalid_mask = folded.isin(SRI_LANKA_ALIASES)
+        invalid_count = int(invalid_mask.sum())
         
         if invalid_count > 0:
             logger.warning(f"Found {invalid_count} rows where Opponent is Sri Lanka")
@@ -268,72 +281,55 @@ class DataValidator:
             self.df = self.df[~invalid_mask]
             self.issues['rows_removed'] += invalid_count
         
-        logger.info(f"✓ Opponent validated ({invalid_count} invalid rows removed)")
+        self.df['Opponent'] = self.df['Opponent'].astype('category')
+        
+        self.stats['SL opponents removed'] = invalid_count
+        logger.debug(f"✓ Opponent validated ({invalid_count} invalid rows removed)")
         return invalid_count
     
     def normalize_margin(self):
         """Normalize margin text format."""
-        logger.info("Normalizing Margin format...")
+        logger.debug("Normalizing Margin format...")
         
-        self.df['Margin'] = self.df['Margin'].fillna('').astype(str).str.strip()
+        margin = self.df['Margin'].fillna('').astype(str).str.strip()
         
         # Standardize whitespace
-        self.df['Margin'] = self.df['Margin'].str.replace(r'\s+', ' ', regex=True)
-        
-        # Handle singular forms first, then standardize to plural (except for 1)
-        # Pattern: number followed by space and "run" or "wicket" (not already plural)
-        def normalize_margin_value(margin):
-            if not margin or margin == 'nan':
-                return ''
-            
-            # Match patterns like "X run", "X runs", "X wicket", "X wickets"
-            import re
-            match = re.match(r'^(\d+)\s+(run|runs|wicket|wickets)$', margin, re.IGNORECASE)
-            if match:
-                number = int(match.group(1))
-                term = match.group(2).lower()
-                
-                # Determine if it's runs or wickets
-                if 'run' in term:
-                    return f"{number} run" if number == 1 else f"{number} runs"
-                elif 'wicket' in term:
-                    return f"{number} wicket" if number == 1 else f"{number} wickets"
-            
-            return margin
+        margin = margin.str.replace(r'\s+', ' ', regex=True)
+        margin = margin.mask(margin == 'nan', '')
+        
+        # Split "X run(s)" / "X wicket(s)" margins into number and unit in one pass,
+        # then rebuild them as singular for 1 and plural otherwise
+        parts = margin.str.extract(MARGIN_PATTERN)
+        number = pd.to_numeric(parts[0])
+        is_wicket = parts[1].str.lower().str.startswith('wicket', na=False)
+        is_one = (number == 1).to_numpy()
+        unit = np.where(
+            is_wicket,
+            np.where(is_one, 'wicket', 'wickets'),
+            np.where(is_one, 'run', 'runs')
+        )
+        normalized = number.astype('Int64').astype(str) + ' ' + unit
         
-        self.df['Margin'] = self.df['Margin'].apply(normalize_margin_value)
+        # Margins that do not match the pattern are kept as-is
+        self.df['Margin'] = normalized.where(parts[0].notna(), margin)
         
-        logger.info("✓ Margin normalized")
+        logger.debug("✓ Margin normalized")
     
     def add_home_away_classification(self):
         """Add Home/Away classification based on venue location."""
-        logger.info("Adding Home/Away classification...")
+        logger.debug("Adding Home/Away classification...")
         
-        def classify_venue(ground):
-            """Classify a venue as Home or Away."""
-            if pd.isna(ground):
-                return 'Away'  # Default to Away if ground is missing
-            
-            ground_str = str(ground)
-            # Check if any Sri Lankan venue keyword is in the ground name
-            for keyword in SRI_LANKAN_VENUES:
-                if keyword.lower() in ground_str.lower():
-                    return 'Home'
-            return 'Away'
-        
-        self.df['Home_Away'] = self.df['Ground'].apply(classify_venue)
-        
-        # Log statistics
-        home_count = (self.df['Home_Away'] == 'Home').sum()
-        away_count = (self.df['Home_Away'] == 'Away').sum()
-        total = len(self.df)
-        logger.info(f"✓ Home/Away classification added:")
-        if total > 0:
-            logger.info(f"  - Home matches: {home_count} ({home_count/total*100:.1f}%)")
-            logger.info(f"  - Away matches: {away_count} ({away_count/total*100:.1f}%)")
-        else:
-            logger.info(f"  - Home matches: {home_count}")
-            logger.info(f"  - Away matches: {away_count}")
+        # Missing grounds are filled once on the column and classified as Away
+        self.df['Ground'] = self.df['Ground'].fillna('')
+        
+        # A ground is Home if it mentions any Sri Lankan venue keyword
+        is_home = self.df['Ground'].astype(str).str.contains(SRI_LANKAN_VENUE_PATTERN, na=False)
+        self.df['Home_Away'] = pd.Categorical(np.where(is_home, 'Home', 'Away'))
+        
+        home_count = int(is_home.sum())
+        self.stats['Home matches'] = home_count
+        self.stats['Away matches'] = len(self.df) - home_count
+        logger.debug(f"✓ Home/Away classification added ({home_count} home matches)")
     
     def remove_duplicates(self) -> int:
         """
@@ -342,18 +338,19 @@ class DataValidator:
         Returns:
             Number of duplicates removed
         """
-        logger.info("Checking for duplicates...")
+        logger.debug("Checking for duplicates...")
         
-        key_columns = ['Match_Date', 'Match_Format', 'Opponent', 'Ground']
+        # Ground is the last string key; coding it on a copy of the keys lets
+        # the duplicate check hash integer codes and timestamps only
+        keys = self.df[DUPLICATE_KEY_COLUMNS].astype({'Ground': 'category'})
+        duplicate_mask = keys.duplicated(keep='first')
+        duplicates = int(duplicate_mask.sum())
+        if duplicates > 0:
+            self.df = self.df[~duplicate_mask]
         
-        before = len(self.df)
-        self.df = self.df.drop_duplicates(subset=key_columns, keep='first')
-        after = len(self.df)
-        
-        duplicates = before - after
         self.issues['duplicates'] = duplicates
         
-        logger.info(f"✓ Duplicates removed: {duplicates}")
+        logger.debug(f"✓ Duplicates removed: {duplicates}")
         return duplicates
     
     def get_cleaned_dataframe(self) -> pd.DataFrame:
@@ -377,7 +374,8 @@ class DataValidator:
             'total_rows_after': len(self.df),
             'duplicates_removed': self.issues['duplicates'],
             'invalid_rows_removed': self.issues['rows_removed'],
-            'issues': self.issues
+            'issues': self.issues,
+            'stats': self.stats
         }
 
 
@@ -404,7 +402,7 @@ def clean_dataset(input_file: str = INPUT_CSV, output_file: str = OUTPUT_CSV) ->
     
     # Load dataset
     logger.info(f"\nLoading dataset from: {input_file}")
-    df = pd.read_csv(input_file)
+    df = pd.read_csv(input_file, dtype=INPUT_DTYPES, parse_dates=['Match_Date'])
     logger.info(f"Loaded {len(df)} rows, {len(df.columns)} columns")
     
     # Initialize validator
@@ -425,12 +423,12 @@ def clean_dataset(input_file: str = INPUT_CSV, output_file: str = OUTPUT_CSV) ->
     
     validator.trim_whitespace()
     validator.validate_match_format()
-    validator.validate_date_format()
-    validator.validate_year_consistency()
+    validator.validate_dates()
     validator.validate_winner()
     validator.validate_opponent()
     validator.normalize_margin()
     validator.add_home_away_classification()
+    logger.info("✓ Cleaning and standardization complete")
     
     # Remove duplicates
     logger.info("\n" + "=" * 80)
@@ -444,14 +442,14 @@ def clean_dataset(input_file: str = INPUT_CSV, output_file: str = OUTPUT_CSV) ->
     summary = validator.get_summary()
     
     # Sort by date
-    cleaned_df = cleaned_df.sort_values('Match_Date').reset_index(drop=True)
+    cleaned_df = cleaned_df.sort_values('Match_Date', kind='stable').reset_index(drop=True)
     
     # Save cleaned dataset
     logger.info("\n" + "=" * 80)
     logger.info("STEP 4: SAVING CLEANED DATASET")
     logger.info("=" * 80)
     
-    cleaned_df.to_csv(output_file, index=False)
+    cleaned_df.to_csv(output_file, index=False, date_format='%Y-%m-%d')
     logger.info(f"✓ Cleaned dataset saved to: {output_file}")
     
     # Print summary
@@ -463,12 +461,17 @@ def clean_dataset(input_file: str = INPUT_CSV, output_file: str = OUTPUT_CSV) ->
     logger.info(f"Duplicates removed:       {summary['duplicates_removed']}")
     logger.info(f"Invalid rows removed:     {summary['invalid_rows_removed']}")
     logger.info(f"Data quality:             {summary['total_rows_after']/summary['total_rows_before']*100:.2f}% retained")
+    for label, count in summary['stats'].items():
+        logger.info(f"{label + ':':<26}{count}")
     
     # Additional statistics
     logger.info("\n" + "=" * 80)
     logger.info("DATASET STATISTICS")
     logger.info("=" * 80)
-    logger.info(f"\nDate range: {cleaned_df['Match_Date'].min()} to {cleaned_df['Match_Date'].max()}")
+    if len(cleaned_df) > 0:
+        logger.info(f"\nDate range: {cleaned_df['Match_Date'].min():%Y-%m-%d} to {cleaned_df['Match_Date'].max():%Y-%m-%d}")
+    else:
+        logger.info("\nDate range: no matches left after cleaning")
     logger.info(f"\nBreakdown by format:")
     logger.info(cleaned_df['Match_Format'].value_counts().to_string())
     logger.info(f"\nBreakdown by winner:")
@@ -487,6 +490,13 @@ def clean_dataset(input_file: str = INPUT_CSV, output_file: str = OUTPUT_CSV) ->
 
 def main():
     """Entry point for CLI."""
+    parser = argparse.ArgumentParser(description="Validate and clean the Sri Lanka cricket dataset.")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="also log the progress of each cleaning step")
+    args = parser.parse_args()
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+    
     try:
         clean_dataset()
     except FileNotFoundError as e:
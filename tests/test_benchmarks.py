@@ -0,0 +1,63 @@
+"""
+Performance benchmarks for the cleaning pipeline (requires pytest-benchmark)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.clean_dataset import DataValidator, VALID_FORMATS
+
+pytest.importorskip('pytest_benchmark')
+
+N_ROWS = 100_000
+
+
+def _run_pipeline(df):
+    """Run every cleaning step in the order used by clean_dataset()."""
+    validator = DataValidator(df)
+    validator.validate_columns()
+    validator.trim_whitespace()
+    validator.validate_match_format()
+    validator.validate_dates()
+    validator.validate_winner()
+    validator.validate_opponent()
+    validator.normalize_margin()
+    validator.add_home_away_classification()
+    validator.remove_duplicates()
+    return validator.get_cleaned_dataframe()
+
+
+@pytest.fixture(scope="module")
+def large_df():
+    """Create a synthetic DataFrame with raw-looking values, seeded for repeatable runs."""
+    rng = np.random.default_rng(42)
+    dates = pd.Timestamp('2000-01-01') + pd.to_timedelta(rng.integers(0, 9500, N_ROWS), unit='D')
+    return pd.DataFrame({
+        'Match_Date': dates.strftime('%m/%d/%Y'),
+        'Match_Format': rng.choice(VALID_FORMATS + ['t20i', ' odi '], N_ROWS),
+        'Opponent': rng.choice(['India', 'Australia', 'England', 'Pakistan'], N_ROWS),
+        'Winner': rng.choice(['Sri Lanka', 'Opponent', 'draw', 'India', ''], N_ROWS),
+        'Margin': rng.choice(['5 wicket', '100  run', '1 runs', ''], N_ROWS),
+        'Ground': rng.choice(['Galle International Stadium', 'MCG', 'R Premadasa Stadium', 'Lords'], N_ROWS),
+        'Year': dates.year,
+        'Gender': rng.choice(['male', 'female'], N_ROWS),
+        'Toss_Winner': '',
+        'Toss_Decision': '',
+        'Player_of_Match': '',
+        'Event_Name': ''
+    })
+
+
+@pytest.mark.slow
+def test_bench_full_pipeline(benchmark, large_df):
+    """Benchmark the full validation pipeline on a large synthetic dataset."""
+    cleaned_df = benchmark(_run_pipeline, large_df)
+
+    assert len(cleaned_df) > 0
+    assert all(cleaned_df['Match_Format'].isin(VALID_FORMATS))
@@ -17,7 +17,8 @@ from src.build_dataset import (
     get_teams,
     determine_winner,
     get_margin,
-    parse_match_json
+    parse_match_json,
+    parse_match_files
 )
 
 
@@ -293,6 +294,37 @@ class TestParseMatchJson:
         assert result['Player_of_Match'] == 'Kumar Sangakkara'
         assert result['Event_Name'] == 'Asia Cup'
     
+    def test_parse_ignores_innings_data(self, tmp_path):
+        """Test that only the info block is decoded from a match file."""
+        json_file = tmp_path / "test_match.json"
+        with open(json_file, 'w') as f:
+            f.write(
+                '{"meta": {"data_version": "1.1.0"}, '
+                '"info": {"teams": ["Sri Lanka", "India"], "dates": ["2020-01-15"], '
+                '"venue": "Galle International Stadium"}, '
+                '"innings": [not valid json'
+            )
+        
+        result = parse_match_json(json_file, 'Test')
+        assert result is not None
+        assert result['Opponent'] == 'India'
+        assert result['Ground'] == 'Galle International Stadium'
+    
+    def test_parse_nested_info_key_before_top_level(self, tmp_path):
+        """Test that a nested info key ahead of the top-level one is ignored."""
+        json_file = tmp_path / "test_match.json"
+        with open(json_file, 'w') as f:
+            f.write(
+                '{"meta": {"x": {"info": {"teams": ["A"]}}}, '
+                '"info": {"teams": ["Sri Lanka", "India"], "dates": ["2020-01-15"], '
+                '"venue": "Galle International Stadium"}, '
+                '"innings": [not valid json'
+            )
+        
+        result = parse_match_json(json_file, 'Test')
+        assert result is not None
+        assert result['Opponent'] == 'India'
+    
     def test_parse_non_sri_lanka_match(self, tmp_path):
         """Test that non-Sri Lanka matches are filtered out."""
         match_data = {
@@ -310,6 +342,26 @@ class TestParseMatchJson:
         result = parse_match_json(json_file, 'Test')
         assert result is None
     
+    def test_parse_sri_lanka_mentioned_outside_teams(self, tmp_path):
+        """Test that a Sri Lanka mention outside the teams list is not a match."""
+        match_data = {
+            'info': {
+                'teams': ['India', 'Australia'],
+                'dates': ['2020-01-15'],
+                'event': {
+                    'name': 'Sri Lanka Tri-Series'
+                },
+                'venue': 'R Premadasa Stadium'
+            }
+        }
+        
+        json_file = tmp_path / "test_match.json"
+        with open(json_file, 'w') as f:
+            json.dump(match_data, f)
+        
+        result = parse_match_json(json_file, 'ODI')
+        assert result is None
+    
     def test_parse_pre_2000_match(self, tmp_path):
         """Test that pre-2000 matches are filtered out."""
         match_data = {
@@ -331,7 +383,7 @@ class TestParseMatchJson:
         """Test handling of invalid JSON."""
         json_file = tmp_path / "invalid.json"
         with open(json_file, 'w') as f:
-            f.write("{ invalid json }")
+            f.write('{ "teams": ["Sri Lanka", invalid json }')
         
         result = parse_match_json(json_file, 'Test')
         assert result is None
@@ -353,5 +405,27 @@ class TestParseMatchJson:
         assert result is None
 
 
+
+class TestParseMatchFiles:
+    """Tests for batch match file parsing."""
+    
+    def test_parse_batch_keeps_only_sri_lanka_matches(self, tmp_path):
+        """Test that a batch returns only Sri Lanka matches, in input order."""
+        fixtures = [
+            ('a.json', ['Sri Lanka', 'India'], '2020-01-15'),
+            ('b.json', ['England', 'Australia'], '2020-01-16'),
+            ('c.json', ['Pakistan', 'Sri Lanka'], '2020-01-17'),
+        ]
+        paths = []
+        for name, teams, date in fixtures:
+            json_file = tmp_path / name
+            with open(json_file, 'w') as f:
+                json.dump({'info': {'teams': teams, 'dates': [date]}}, f)
+            paths.append(str(json_file))
+        
+        result = parse_match_files(paths, 'ODI')
+        assert [match['Opponent'] for match in result] == ['India', 'Pakistan']
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -2,24 +2,50 @@
 Unit tests for data cleaning and validation
 """
 
+import numpy as np
 import pandas as pd
 import pytest
 import sys
 import os
+from datetime import date
 from pathlib import Path
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.clean_dataset import DataValidator, EXPECTED_COLUMNS, VALID_FORMATS, VALID_WINNERS
+from src.clean_dataset import DataValidator, clean_dataset, EXPECTED_COLUMNS, VALID_FORMATS, VALID_WINNERS
+
+# Values for the columns a test does not care about
+BASE_ROW = {
+    'Match_Date': '2020-01-15',
+    'Match_Format': 'Test',
+    'Opponent': 'India',
+    'Winner': 'Sri Lanka',
+    'Margin': '',
+    'Ground': 'Galle',
+    'Year': 2020,
+    'Gender': 'male',
+    'Toss_Winner': '',
+    'Toss_Decision': '',
+    'Player_of_Match': '',
+    'Event_Name': ''
+}
+
+
+def _make_df(override):
+    """Build a DataFrame from BASE_ROW with the given columns replaced."""
+    n_rows = len(next(iter(override.values())))
+    data = {col: np.full(n_rows, value) for col, value in BASE_ROW.items()}
+    data.update(override)
+    return pd.DataFrame(data)
 
 
 class TestDataValidator:
     """Tests for DataValidator class."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def sample_df(self):
-        """Create a sample DataFrame for testing."""
+        """Create a sample DataFrame, shared by all tests; DataValidator never modifies it."""
         return pd.DataFrame({
             'Match_Date': ['2020-01-15', '2021-03-20', '2019-12-01'],
             'Match_Format': ['Test', 'ODI', 'T20'],
@@ -35,11 +61,15 @@ class TestDataValidator:
             'Event_Name': ['', '', '']
         })
     
-    def test_validate_columns_success(self, sample_df):
+    @pytest.fixture(scope="module")
+    def ro_validator(self, sample_df):
+        """Create a validator shared by tests that do not run any cleaning step on it."""
+        return DataValidator(sample_df)
+    
+    def test_validate_columns_success(self, ro_validator):
         """Test successful column validation."""
-        validator = DataValidator(sample_df)
-        assert validator.validate_columns() is True
-        assert len(validator.issues['missing_columns']) == 0
+        assert ro_validator.validate_columns() is True
+        assert len(ro_validator.issues['missing_columns']) == 0
     
     def test_validate_columns_missing(self):
         """Test column validation with missing columns."""
@@ -53,24 +83,21 @@ class TestDataValidator:
     
     def test_validate_columns_extra(self, sample_df):
         """Test column validation with extra columns."""
-        sample_df['Extra_Column'] = [1, 2, 3]
-        validator = DataValidator(sample_df)
+        validator = DataValidator(sample_df.assign(Extra_Column=[1, 2, 3]))
         assert validator.validate_columns() is True
         assert 'Extra_Column' not in validator.df.columns
     
     def test_trim_whitespace(self):
         """Test whitespace trimming."""
-        df = pd.DataFrame({
-            'Match_Date': ['2020-01-15'],
+        df = _make_df({
             'Match_Format': ['  Test  '],
             'Opponent': ['India  '],
             'Winner': ['  Sri Lanka'],
             'Margin': ['5 wickets'],
             'Ground': ['  Galle  '],
-            'Year': [2020],
             'Toss_Winner': ['Sri Lanka'],
             'Toss_Decision': ['bat'],
-            'Player_of_Match': ['Kumar Sangakkara'],
+            'Player_of_Match': [None],
             'Event_Name': ['Asia Cup']
         })
         validator = DataValidator(df)
@@ -80,6 +107,19 @@ class TestDataValidator:
         assert validator.df['Opponent'].iloc[0] == 'India'
         assert validator.df['Winner'].iloc[0] == 'Sri Lanka'
         assert validator.df['Ground'].iloc[0] == 'Galle'
+        assert validator.df['Player_of_Match'].iloc[0] == ''
+    
+    def test_trim_whitespace_non_string_values(self):
+        """Test that non-string values in object columns are converted, not dropped."""
+        df = _make_df({
+            'Match_Date': [date(2020, 1, 15), date(2020, 1, 16)],
+            'Ground': [123, ' Galle ']
+        })
+        validator = DataValidator(df)
+        validator.trim_whitespace()
+        
+        assert validator.df['Match_Date'].tolist() == ['2020-01-15', '2020-01-16']
+        assert validator.df['Ground'].tolist() == ['123', 'Galle']
     
     def test_validate_match_format_valid(self, sample_df):
         """Test match format validation with valid data."""
@@ -88,42 +128,25 @@ class TestDataValidator:
         assert invalid_count == 0
         assert all(validator.df['Match_Format'].isin(VALID_FORMATS))
     
-    def test_validate_match_format_standardization(self):
-        """Test match format standardization."""
-        df = pd.DataFrame({
-            'Match_Date': ['2020-01-15', '2020-01-16', '2020-01-17'],
-            'Match_Format': ['t20i', 'odi', 'test'],
-            'Opponent': ['India', 'India', 'India'],
-            'Winner': ['Sri Lanka', 'Sri Lanka', 'Sri Lanka'],
-            'Margin': ['5 wickets', '5 wickets', '5 wickets'],
-            'Ground': ['Galle', 'Galle', 'Galle'],
-            'Year': [2020, 2020, 2020],
-            'Toss_Winner': ['', '', ''],
-            'Toss_Decision': ['', '', ''],
-            'Player_of_Match': ['', '', ''],
-            'Event_Name': ['', '', '']
-        })
-        validator = DataValidator(df)
-        validator.validate_match_format()
+    @pytest.mark.parametrize("col,inp,exp,method", [
+        ('Match_Format', ['t20i', 'odi', 'test'], ['T20', 'ODI', 'Test'], 'validate_match_format'),
+        ('Winner', ['sri lanka', 'DRAW', 'tied', 'no result'],
+         ['Sri Lanka', 'Draw', 'Tie', 'No Result'], 'validate_winner'),
+        ('Margin', ['5 wicket', '100  run', '1 runs'], ['5 wickets', '100 runs', '1 run'], 'normalize_margin'),
+    ])
+    def test_column_standardization(self, col, inp, exp, method):
+        """Test standardization of match format, winner and margin values."""
+        validator = DataValidator(_make_df({col: inp}))
+        getattr(validator, method)()
         
-        assert validator.df['Match_Format'].iloc[0] == 'T20'
-        assert validator.df['Match_Format'].iloc[1] == 'ODI'
-        assert validator.df['Match_Format'].iloc[2] == 'Test'
+        assert validator.df[col].tolist() == exp
     
     def test_validate_match_format_invalid(self):
         """Test match format validation with invalid data."""
-        df = pd.DataFrame({
+        df = _make_df({
             'Match_Date': ['2020-01-15', '2020-01-16'],
             'Match_Format': ['Test', 'Invalid_Format'],
-            'Opponent': ['India', 'India'],
-            'Winner': ['Sri Lanka', 'Sri Lanka'],
-            'Margin': ['5 wickets', '5 wickets'],
-            'Ground': ['Galle', 'Galle'],
-            'Year': [2020, 2020],
-            'Toss_Winner': ['', ''],
-            'Toss_Decision': ['', ''],
-            'Player_of_Match': ['', ''],
-            'Event_Name': ['', '']
+            'Margin': ['5 wickets', '5 wickets']
         })
         validator = DataValidator(df)
         invalid_count = validator.validate_match_format()
@@ -132,66 +155,67 @@ class TestDataValidator:
         assert len(validator.df) == 1
         assert validator.df['Match_Format'].iloc[0] == 'Test'
     
-    def test_validate_winner_standardization(self):
-        """Test winner value standardization."""
-        df = pd.DataFrame({
-            'Match_Date': ['2020-01-15', '2020-01-16', '2020-01-17', '2020-01-18'],
-            'Match_Format': ['Test', 'ODI', 'T20', 'ODI'],
-            'Opponent': ['India', 'India', 'India', 'India'],
-            'Winner': ['sri lanka', 'DRAW', 'tied', 'no result'],
-            'Margin': ['', '', '', ''],
-            'Ground': ['Galle', 'Galle', 'Galle', 'Galle'],
-            'Year': [2020, 2020, 2020, 2020],
-            'Toss_Winner': ['', '', '', ''],
-            'Toss_Decision': ['', '', '', ''],
-            'Player_of_Match': ['', '', '', ''],
-            'Event_Name': ['', '', '', '']
+    def test_validate_winner_unknown_team(self):
+        """Test that unrecognized winner names are mapped to Opponent."""
+        df = _make_df({
+            'Match_Date': ['2020-01-15', '2020-01-16'],
+            'Match_Format': ['Test', 'ODI'],
+            'Winner': ['India', 'Sri Lanka']
         })
         validator = DataValidator(df)
-        validator.validate_winner()
+        invalid_count = validator.validate_winner()
         
-        assert validator.df['Winner'].iloc[0] == 'Sri Lanka'
-        assert validator.df['Winner'].iloc[1] == 'Draw'
-        assert validator.df['Winner'].iloc[2] == 'Tie'
-        assert validator.df['Winner'].iloc[3] == 'No Result'
+        assert invalid_count == 1
+        assert validator.df['Winner'].tolist() == ['Opponent', 'Sri Lanka']
     
-    def test_validate_date_format_valid(self, sample_df):
+    def test_validate_dates_valid(self, sample_df):
         """Test date format validation with valid dates."""
         validator = DataValidator(sample_df)
-        invalid_count = validator.validate_date_format()
+        invalid_count = validator.validate_dates()
         assert invalid_count == 0
     
-    def test_validate_date_format_invalid(self):
+    def test_validate_dates_invalid(self):
         """Test date format validation with invalid dates."""
-        df = pd.DataFrame({
+        df = _make_df({
             'Match_Date': ['2020-01-15', '01/15/2020', 'invalid'],
             'Match_Format': ['Test', 'ODI', 'T20'],
-            'Opponent': ['India', 'India', 'India'],
-            'Winner': ['Sri Lanka', 'Sri Lanka', 'Sri Lanka'],
-            'Margin': ['5 wickets', '5 wickets', '5 wickets'],
-            'Ground': ['Galle', 'Galle', 'Galle'],
-            'Year': [2020, 2020, 2020],
-            'Toss_Winner': ['', '', ''],
-            'Toss_Decision': ['', '', ''],
-            'Player_of_Match': ['', '', ''],
-            'Event_Name': ['', '', '']
+            'Margin': ['5 wickets', '5 wickets', '5 wickets']
         })
         validator = DataValidator(df)
-        invalid_count = validator.validate_date_format()
+        invalid_count = validator.validate_dates()
         
         assert invalid_count == 2
         assert len(validator.df) == 1
-        assert validator.df['Match_Date'].iloc[0] == '2020-01-15'
+        assert validator.df['Match_Date'].iloc[0] == pd.Timestamp('2020-01-15')
     
-    def test_validate_year_consistency(self, sample_df):
-        """Test year consistency validation."""
-        validator = DataValidator(sample_df)
-        validator.validate_year_consistency()
+    def test_validate_dates_month_first(self, sample_df):
+        """Test that month-first dates are parsed as month/day/year."""
+        df = sample_df.assign(Match_Date=['6/27/2002', '1/9/2003', '12/31/2019'])
+        validator = DataValidator(df)
+        invalid_count = validator.validate_dates()
+        
+        assert invalid_count == 0
+        assert validator.df['Match_Date'].dt.strftime('%Y-%m-%d').tolist() == ['2002-06-27', '2003-01-09', '2019-12-31']
+        assert validator.df['Year'].tolist() == [2002, 2003, 2019]
+    
+    def test_validate_dates_derives_year(self, sample_df):
+        """Test that Year is derived from Match_Date."""
+        validator = DataValidator(sample_df.assign(Year=[1999, 1999, 1999]))
+        validator.validate_dates()
         
         assert validator.df['Year'].iloc[0] == 2020
         assert validator.df['Year'].iloc[1] == 2021
         assert validator.df['Year'].iloc[2] == 2019
     
+    def test_validate_dates_already_parsed(self, sample_df):
+        """Test that a datetime64 Match_Date is used without re-parsing."""
+        df = sample_df.assign(Match_Date=pd.to_datetime(sample_df['Match_Date']))
+        validator = DataValidator(df)
+        invalid_count = validator.validate_dates()
+        
+        assert invalid_count == 0
+        assert validator.df['Match_Date'].dt.strftime('%Y-%m-%d').tolist() == ['2020-01-15', '2021-03-20', '2019-12-01']
+    
     def test_validate_opponent_valid(self, sample_df):
         """Test opponent validation with valid data."""
         validator = DataValidator(sample_df)
@@ -200,18 +224,12 @@ class TestDataValidator:
     
     def test_validate_opponent_invalid(self):
         """Test opponent validation with Sri Lanka as opponent."""
-        df = pd.DataFrame({
+        df = _make_df({
             'Match_Date': ['2020-01-15', '2020-01-16'],
             'Match_Format': ['Test', 'ODI'],
             'Opponent': ['India', 'Sri Lanka'],
             'Winner': ['Sri Lanka', 'Opponent'],
-            'Margin': ['5 wickets', '5 wickets'],
-            'Ground': ['Galle', 'Galle'],
-            'Year': [2020, 2020],
-            'Toss_Winner': ['', ''],
-            'Toss_Decision': ['', ''],
-            'Player_of_Match': ['', ''],
-            'Event_Name': ['', '']
+            'Margin': ['5 wickets', '5 wickets']
         })
         validator = DataValidator(df)
         invalid_count = validator.validate_opponent()
@@ -220,42 +238,49 @@ class TestDataValidator:
         assert len(validator.df) == 1
         assert validator.df['Opponent'].iloc[0] == 'India'
     
-    def test_normalize_margin(self):
-        """Test margin normalization."""
-        df = pd.DataFrame({
-            'Match_Date': ['2020-01-15', '2020-01-16', '2020-01-17'],
-            'Match_Format': ['Test', 'ODI', 'T20'],
-            'Opponent': ['India', 'India', 'India'],
-            'Winner': ['Sri Lanka', 'Opponent', 'Sri Lanka'],
-            'Margin': ['5 wicket', '100  run', '1 runs'],
-            'Ground': ['Galle', 'Galle', 'Galle'],
-            'Year': [2020, 2020, 2020],
-            'Toss_Winner': ['', '', ''],
-            'Toss_Decision': ['', '', ''],
-            'Player_of_Match': ['', '', ''],
-            'Event_Name': ['', '', '']
+    def test_validate_opponent_case_and_spacing_variants(self, sample_df):
+        """Test that Sri Lanka is caught regardless of case and spacing."""
+        df = sample_df.assign(Opponent=['SRI LANKA', 'Sri  Lanka', 'England'])
+        validator = DataValidator(df)
+        invalid_count = validator.validate_opponent()
+        
+        assert invalid_count == 2
+        assert validator.df['Opponent'].tolist() == ['England']
+    
+    def test_add_home_away_classification(self):
+        """Test home/away classification from venue names."""
+        df = _make_df({
+            'Match_Date': ['2020-01-15', '2020-01-16', '2020-01-17', '2020-01-18'],
+            'Match_Format': ['Test', 'ODI', 'T20', 'ODI'],
+            'Winner': ['Sri Lanka', 'Opponent', 'Sri Lanka', 'Opponent'],
+            'Ground': ['Galle International Stadium', 'r premadasa stadium, colombo', 'Eden Gardens', None]
         })
         validator = DataValidator(df)
-        validator.normalize_margin()
+        validator.add_home_away_classification()
+        
+        assert validator.df['Home_Away'].tolist() == ['Home', 'Home', 'Away', 'Away']
+        assert validator.df['Ground'].iloc[3] == ''
+    
+    @pytest.mark.parametrize("ground,expected", [
+        (pd.Series([123, 'Galle'], dtype=object), ['Away', 'Home']),
+        (pd.Series([np.nan, np.nan], dtype=float), ['Away', 'Away']),
+        (pd.Series([], dtype=float), []),
+    ])
+    def test_add_home_away_non_string_ground(self, ground, expected):
+        """Test that numeric, all-missing and empty Ground columns are classified without errors."""
+        validator = DataValidator(pd.DataFrame({'Ground': ground}))
+        validator.add_home_away_classification()
         
-        assert validator.df['Margin'].iloc[0] == '5 wickets'
-        assert validator.df['Margin'].iloc[1] == '100 runs'
-        assert validator.df['Margin'].iloc[2] == '1 run'
+        assert validator.df['Home_Away'].tolist() == expected
     
     def test_remove_duplicates(self):
         """Test duplicate removal."""
-        df = pd.DataFrame({
+        df = _make_df({
             'Match_Date': ['2020-01-15', '2020-01-15', '2020-01-16'],
             'Match_Format': ['Test', 'Test', 'ODI'],
-            'Opponent': ['India', 'India', 'India'],
             'Winner': ['Sri Lanka', 'Sri Lanka', 'Opponent'],
             'Margin': ['5 wickets', '5 wickets', '50 runs'],
-            'Ground': ['Galle', 'Galle', 'Colombo'],
-            'Year': [2020, 2020, 2020],
-            'Toss_Winner': ['', '', ''],
-            'Toss_Decision': ['', '', ''],
-            'Player_of_Match': ['', '', ''],
-            'Event_Name': ['', '', '']
+            'Ground': ['Galle', 'Galle', 'Colombo']
         })
         validator = DataValidator(df)
         duplicates = validator.remove_duplicates()
@@ -263,40 +288,55 @@ class TestDataValidator:
         assert duplicates == 1
         assert len(validator.df) == 2
     
-    def test_get_summary(self, sample_df):
+    def test_remove_duplicates_keeps_ground_dtype(self):
+        """Test that duplicate removal leaves Ground as-is for later steps."""
+        validator = DataValidator(_make_df({'Ground': ['Galle', None]}))
+        validator.remove_duplicates()
+        validator.add_home_away_classification()
+        
+        assert validator.df['Ground'].dtype == object
+        assert validator.df['Home_Away'].tolist() == ['Home', 'Away']
+    
+    def test_remove_duplicates_typed_keys(self, sample_df):
+        """Test duplicate removal on parsed dates and categorical keys."""
+        df = pd.concat([sample_df, sample_df.iloc[[0]].assign(Match_Date=' 2020-01-15 ')],
+                       ignore_index=True)
+        validator = DataValidator(df)
+        validator.validate_match_format()
+        validator.validate_dates()
+        validator.validate_opponent()
+        duplicates = validator.remove_duplicates()
+        
+        assert duplicates == 1
+        assert len(validator.df) == 3
+    
+    def test_get_summary(self, ro_validator):
         """Test summary generation."""
-        validator = DataValidator(sample_df)
-        summary = validator.get_summary()
+        summary = ro_validator.get_summary()
         
         assert 'total_rows_before' in summary
         assert 'total_rows_after' in summary
         assert 'duplicates_removed' in summary
         assert 'invalid_rows_removed' in summary
         assert summary['total_rows_before'] == 3
+        assert summary['stats'] == {}
     
     def test_full_validation_pipeline(self):
         """Test complete validation pipeline."""
-        df = pd.DataFrame({
+        df = _make_df({
             'Match_Date': ['2020-01-15', '2020-01-15', '2020-01-16', 'invalid'],
             'Match_Format': ['  test  ', 't20i', 'ODI', 'Test'],
             'Opponent': ['India', 'India', 'Australia', 'England'],
             'Winner': ['sri lanka', 'draw', 'opponent', 'Sri Lanka'],
             'Margin': ['5 wicket', '', '100 run', '1 runs'],
-            'Ground': ['Galle', 'Galle', 'MCG', 'Lords'],
-            'Year': [2020, 2020, 2020, 2020],
-            'Gender': ['male', 'male', 'male', 'male'],
-            'Toss_Winner': ['', '', '', ''],
-            'Toss_Decision': ['', '', '', ''],
-            'Player_of_Match': ['', '', '', ''],
-            'Event_Name': ['', '', '', '']
+            'Ground': ['Galle', 'Galle', 'MCG', 'Lords']
         })
         
         validator = DataValidator(df)
         validator.validate_columns()
         validator.trim_whitespace()
         validator.validate_match_format()
-        validator.validate_date_format()
-        validator.validate_year_consistency()
+        validator.validate_dates()
         validator.validate_winner()
         validator.validate_opponent()
         validator.normalize_margin()
@@ -311,8 +351,53 @@ class TestDataValidator:
         # Row 2: 2020-01-16, ODI, Australia, MCG
         # So actually 3 unique rows remain after removing invalid date
         assert len(cleaned_df) == 3
+        assert validator.get_summary()['stats']['Invalid dates removed'] == 1
         assert all(cleaned_df['Match_Format'].isin(VALID_FORMATS))
         assert all(cleaned_df['Winner'].isin(VALID_WINNERS))
+        
+        for col in ['Match_Format', 'Opponent', 'Winner']:
+            assert isinstance(cleaned_df[col].dtype, pd.CategoricalDtype)
+    
+    def test_input_dataframe_not_modified(self):
+        """Test that cleaning leaves the caller's DataFrame untouched."""
+        df = _make_df({
+            'Match_Date': ['2020-01-15', '2020-01-16'],
+            'Match_Format': [' test ', 'odi'],
+            'Opponent': ['India', 'Australia'],
+            'Winner': ['sri lanka', 'Pakistan'],
+            'Margin': ['5 wicket', '1 runs'],
+            'Ground': ['Galle', 'MCG'],
+            'Year': [2019, 2019]
+        })
+        original = df.copy()
+        
+        validator = DataValidator(df)
+        validator.trim_whitespace()
+        validator.validate_match_format()
+        validator.validate_dates()
+        validator.validate_winner()
+        validator.validate_opponent()
+        validator.normalize_margin()
+        validator.add_home_away_classification()
+        validator.remove_duplicates()
+        
+        pd.testing.assert_frame_equal(df, original)
+
+
+
+class TestCleanDataset:
+    """Tests for the clean_dataset() entry point."""
+    
+    def test_all_rows_invalid(self, tmp_path):
+        """Test that cleaning completes and writes a header-only CSV when every row is removed."""
+        input_file = tmp_path / 'raw.csv'
+        output_file = tmp_path / 'clean.csv'
+        _make_df({'Match_Date': ['notadate']}).to_csv(input_file, index=False)
+        
+        summary = clean_dataset(str(input_file), str(output_file))
+        
+        assert summary['total_rows_after'] == 0
+        assert pd.read_csv(output_file).empty
 
 
 if __name__ == '__main__':
@@ -2,13 +2,12 @@
 Automated Dataset Update Script
 
 This script updates the entire dataset pipeline:
-1. Downloads latest Cricsheet data
-2. Builds raw dataset
-3. Cleans and validates data
-4. Regenerates EDA visualizations
-5. Updates kaggle_release folder
-6. Updates README with new statistics
-7. Commits and pushes changes to GitHub
+1. Builds raw dataset from the latest Cricsheet data
+2. Cleans and validates data
+3. Regenerates EDA visualizations
+4. Updates kaggle_release folder and README statistics
+5. Runs the unit tests
+6. Commits changes, then pushes to GitHub once the summary is printed
 
 Usage:
     python update_dataset.py
@@ -16,45 +15,111 @@ Usage:
 Run this script monthly to keep the dataset current.
 """
 
+import hashlib
+import os
 import subprocess
 import sys
 import pandas as pd
 import shutil
-import re
+import shlex
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from string import Template
 from datetime import datetime
 
 
-def run_command(command, description):
-    """Execute a command and handle errors."""
-    print(f"\n{'=' * 80}")
-    print(f"{description}")
-    print(f"{'=' * 80}")
-    
+SEPARATOR = '=' * 80
+
+# Files copied into kaggle_release/ on every update: (source, destination, label)
+KAGGLE_RELEASE_FILES = [
+    ('sri_lanka_international_cricket_matches_2000_present_clean.csv',
+     'kaggle_release/sri_lanka_international_cricket_matches_2000_present_clean.csv',
+     'clean CSV'),
+    ('data_dictionary.md', 'kaggle_release/data_dictionary.md', 'data dictionary'),
+]
+
+# Final step of the update, run in place of this process
+PUSH_COMMAND = ['git', 'push', 'origin', 'main']
+
+# EDA charts are rebuilt only when their inputs change
+EDA_INPUTS = [
+    'sri_lanka_international_cricket_matches_2000_present_clean.csv',
+    'notebooks/eda_sri_lanka_cricket.py',
+]
+EDA_OUTPUT_DIR = Path('eda_outputs')
+EDA_HASH_FILE = Path('.cache/eda_hash')
+
+# README statistics block, regenerated in full between these markers
+README_STATS_BEGIN = '<!-- STATS-BEGIN -->'
+README_STATS_END = '<!-- STATS-END -->'
+README_STATS_TEMPLATE = Template("""
+| Statistic | Value |
+|---|---|
+| Total matches | $total_matches |
+| Date range | $min_date to $max_date |
+| Last updated | $month |
+""")
+
+
+def print_banner(title):
+    """Print a section title between separator lines with a single write."""
+    sys.stdout.write(f"\n{SEPARATOR}\n{title}\n{SEPARATOR}\n")
+
+
+def _stream_command(command, cwd=None):
+    """Run a command given as an argument list, echoing its output; return the exit status."""
+    # Stream the command's output (stderr merged into stdout) as it runs
     try:
-        result = subprocess.run(
+        process = subprocess.Popen(
             command,
-            shell=True,
-            check=True,
-            capture_output=True,
-            text=True
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            # Python steps would otherwise block-buffer their output into the pipe
+            env={**os.environ, 'PYTHONUNBUFFERED': '1'}
         )
-        print(result.stdout)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error: {e}")
-        print(e.stderr)
-        return False
+    except OSError as e:
+        print(f"❌ Error: Could not run '{shlex.join(command)}': {e}")
+        return 127
+    for line in process.stdout:
+        print(line, end='')
+    returncode = process.wait()
+    
+    if returncode != 0:
+        print(f"❌ Error: Command '{shlex.join(command)}' returned non-zero exit status {returncode}.")
+    return returncode
+
+
+def run_command(command, description, cwd=None):
+    """Execute a command (an argument list, run without a shell) in `cwd` and handle errors."""
+    print_banner(description)
+    
+    return _stream_command(command, cwd=cwd) == 0
+
+
+def run_commands(commands, description):
+    """Execute a sequence of commands, stopping at the first one that fails."""
+    print_banner(description)
+    
+    return all(_stream_command(command) == 0 for command in commands)
+
 
+def hash_files(paths):
+    """Return a BLAKE2b hex digest over the contents of the given files."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
 
-def update_readme_stats(csv_path):
-    """Update README with latest dataset statistics."""
-    print(f"\n{'=' * 80}")
-    print("Updating README Statistics")
-    print(f"{'=' * 80}")
+
+def update_readme_stats(csv_path, now=None):
+    """Update README with latest dataset statistics, as of `now` (default: current time)."""
+    print_banner("Updating README Statistics")
     
-    # Read the clean dataset
-    df = pd.read_csv(csv_path)
+    # Only Match_Date is needed for the statistics
+    df = pd.read_csv(csv_path, usecols=['Match_Date'])
     
     # Calculate statistics
     total_matches = len(df)
@@ -69,158 +134,131 @@ def update_readme_stats(csv_path):
     readme_path = Path('README.md')
     readme_content = readme_path.read_text(encoding='utf-8')
     
-    # Update badge with new match count
-    readme_content = re.sub(
-        r'\[!\[Dataset\]\(https://img\.shields\.io/badge/matches-\d+-orange\.svg\)\]',
-        f'[![Dataset](https://img.shields.io/badge/matches-{total_matches}-orange.svg)]',
-        readme_content
-    )
+    original_content = readme_content
+    now = now or datetime.now()
     
-    # Update Dataset Summary table
-    readme_content = re.sub(
-        r'\| \*\*Time Period\*\* \| January 2000 – .+ \|',
-        f'| **Time Period** | January 2000 – {max_date} |',
-        readme_content
-    )
+    # Replace everything between the markers with a freshly rendered block
+    start = readme_content.find(README_STATS_BEGIN)
+    end = readme_content.find(README_STATS_END, start)
+    if start == -1 or end == -1:
+        raise ValueError(f"README is missing the {README_STATS_BEGIN} / {README_STATS_END} markers")
     
-    readme_content = re.sub(
-        r'\| \*\*Total Matches\*\* \| \d+,?\d* matches \|',
-        f'| **Total Matches** | {total_matches:,} matches |',
-        readme_content
+    stats_block = README_STATS_TEMPLATE.substitute(
+        total_matches=f"{total_matches:,}",
+        min_date=min_date,
+        max_date=max_date,
+        month=now.strftime("%B %Y")
     )
-    
-    # Update Last Updated in data dictionary overview
-    current_month_year = datetime.now().strftime("%B %Y")
-    readme_content = re.sub(
-        r'\*\*Last Updated\*\*: .+ 20\d{2}',
-        f'**Last Updated**: {current_month_year}',
-        readme_content
+    readme_content = (
+        readme_content[:start + len(README_STATS_BEGIN)] + stats_block + readme_content[end:]
     )
     
-    # Update footer
-    current_month = datetime.now().strftime("%B %Y")
-    readme_content = re.sub(
-        r'\*Last Updated: .+ \| Dataset Version: .+ \| Matches: \d+,?\d*\*',
-        f'*Last Updated: {current_month} | Dataset Version: 1.0 | Matches: {total_matches:,}*',
-        readme_content
-    )
-    
-    # Write updated README
-    readme_path.write_text(readme_content, encoding='utf-8')
-    print("✅ README updated successfully")
+    # Write updated README, leaving the file untouched when nothing changed
+    if readme_content == original_content:
+        print("✅ README statistics already up to date")
+    else:
+        readme_path.write_text(readme_content, encoding='utf-8')
+        print("✅ README updated successfully")
     
     return total_matches, min_date, max_date
 
 
 def main():
     """Main update pipeline."""
-    print(f"\n{'=' * 80}")
-    print("SRI LANKA CRICKET DATASET - AUTOMATED UPDATE")
-    print(f"{'=' * 80}")
-    print(f"Update started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print_banner("SRI LANKA CRICKET DATASET - AUTOMATED UPDATE")
+    started_at = datetime.now()
+    print(f"Update started: {started_at.strftime('%Y-%m-%d %H:%M:%S')}")
     
     # Step 1: Build raw dataset
     if not run_command(
-        "python -m src.build_dataset",
-        "STEP 1/7: Building Raw Dataset from Cricsheet"
+        [sys.executable, '-m', 'src.build_dataset'],
+        "STEP 1/6: Building Raw Dataset from Cricsheet"
     ):
         print("\n❌ Failed to build dataset. Exiting.")
         sys.exit(1)
     
     # Step 2: Clean and validate dataset
     if not run_command(
-        "python -m src.clean_dataset",
-        "STEP 2/7: Cleaning and Validating Dataset"
+        [sys.executable, '-m', 'src.clean_dataset'],
+        "STEP 2/6: Cleaning and Validating Dataset"
     ):
         print("\n❌ Failed to clean dataset. Exiting.")
         sys.exit(1)
     
     # Step 3: Regenerate EDA visualizations
-    print(f"\n{'=' * 80}")
-    print("STEP 3/7: Regenerating EDA Visualizations")
-    print(f"{'=' * 80}")
-    
-    # Change to notebooks directory and run EDA
-    original_dir = Path.cwd()
-    notebooks_dir = Path('notebooks')
+    print_banner("STEP 3/6: Regenerating EDA Visualizations")
     
+    # The EDA script writes its charts relative to notebooks/
     try:
-        import os
-        os.chdir(notebooks_dir)
-        
-        if not run_command(
-            "python eda_sri_lanka_cricket.py",
-            "Generating charts..."
-        ):
-            print("⚠️  Warning: EDA generation failed, but continuing...")
-        
-        os.chdir(original_dir)
-    except Exception as e:
+        eda_hash = hash_files(EDA_INPUTS)
+        if (EDA_OUTPUT_DIR.is_dir() and EDA_HASH_FILE.exists()
+                and EDA_HASH_FILE.read_text() == eda_hash):
+            print("✅ Clean CSV and EDA script unchanged, skipping chart generation")
+        else:
+            eda_succeeded = run_command(
+                [sys.executable, 'eda_sri_lanka_cricket.py'],
+                "Generating charts...",
+                cwd='notebooks'
+            )
+            
+            # Remember the inputs only once the charts were built from them
+            if eda_succeeded:
+                EDA_HASH_FILE.parent.mkdir(exist_ok=True)
+                EDA_HASH_FILE.write_text(eda_hash)
+            else:
+                print("⚠️  Warning: EDA generation failed, but continuing...")
+    except OSError as e:
         print(f"⚠️  Warning: Could not run EDA script: {e}")
-        os.chdir(original_dir)
     
     # Step 4: Copy files to kaggle_release
-    print(f"\n{'=' * 80}")
-    print("STEP 4/7: Updating Kaggle Release Folder")
-    print(f"{'=' * 80}")
+    print_banner("STEP 4/6: Updating Kaggle Release Folder")
     
     try:
-        shutil.copy(
-            'sri_lanka_international_cricket_matches_2000_present_clean.csv',
-            'kaggle_release/sri_lanka_international_cricket_matches_2000_present_clean.csv'
-        )
-        print("✅ Copied clean CSV to kaggle_release/")
-        
-        shutil.copy(
-            'data_dictionary.md',
-            'kaggle_release/data_dictionary.md'
-        )
-        print("✅ Copied data dictionary to kaggle_release/")
+        # The copies are independent, so run them concurrently
+        with ThreadPoolExecutor(max_workers=len(KAGGLE_RELEASE_FILES)) as executor:
+            list(executor.map(lambda files: shutil.copy(files[0], files[1]), KAGGLE_RELEASE_FILES))
+        for _, _, label in KAGGLE_RELEASE_FILES:
+            print(f"✅ Copied {label} to kaggle_release/")
     except Exception as e:
         print(f"⚠️  Warning: Could not copy files: {e}")
     
-    # Step 5: Update README statistics
+    # Step 4 (cont.): Update README statistics
     try:
         total_matches, min_date, max_date = update_readme_stats(
-            'sri_lanka_international_cricket_matches_2000_present_clean.csv'
+            'sri_lanka_international_cricket_matches_2000_present_clean.csv',
+            now=started_at
         )
     except Exception as e:
         print(f"⚠️  Warning: Could not update README: {e}")
         total_matches = "unknown"
     
-    # Step 6: Run tests (optional)
-    print(f"\n{'=' * 80}")
-    print("STEP 5/7: Running Tests (Optional)")
-    print(f"{'=' * 80}")
+    # Step 5: Run tests (optional)
+    print_banner("STEP 5/6: Running Tests (Optional)")
     
+    # The slow benchmark tests are left for explicit runs
     run_command(
-        "pytest tests/ -v",
+        [sys.executable, '-m', 'pytest', 'tests/', '-q', '-m', 'not slow'],
         "Validating with unit tests..."
     )
     
-    # Step 7: Git commit and push
-    print(f"\n{'=' * 80}")
-    print("STEP 6/7: Committing Changes to Git")
-    print(f"{'=' * 80}")
+    # Step 6: Git commit (the push runs last, after the summary)
+    print_banner("STEP 6/6: Committing Changes to Git")
     
-    commit_message = f"Auto-update dataset: {total_matches} matches as of {datetime.now().strftime('%Y-%m-%d')}"
+    commit_message = f"Auto-update dataset: {total_matches} matches as of {started_at.strftime('%Y-%m-%d')}"
     
-    run_command("git add .", "Staging all changes...")
-    run_command(f'git commit -m "{commit_message}"', "Committing changes...")
-    
-    print(f"\n{'=' * 80}")
-    print("STEP 7/7: Pushing to GitHub")
-    print(f"{'=' * 80}")
-    
-    if run_command("git push origin main", "Pushing to remote repository..."):
-        print("\n✅ Successfully pushed to GitHub!")
-    else:
-        print("\n⚠️  Could not push to GitHub. Push manually with: git push origin main")
+    # The push is handed over to git after the summary, and only if the commit succeeded
+    commit_commands = [
+        ['git', 'add', '.'],
+        ['git', 'commit', '-m', commit_message],
+    ]
+    committed = run_commands(commit_commands, "Staging and committing changes...")
+    if not committed:
+        print("\n⚠️  Could not commit changes. Commit and push manually with:")
+        for command in commit_commands + [PUSH_COMMAND]:
+            print(f"  {shlex.join(command)}")
     
     # Summary
-    print(f"\n{'=' * 80}")
-    print("✅ UPDATE COMPLETE!")
-    print(f"{'=' * 80}")
+    print_banner("✅ UPDATE COMPLETE!")
     print(f"📊 Dataset Statistics:")
     print(f"  • Total matches: {total_matches}")
     print(f"  • Updated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -234,7 +272,16 @@ def main():
     print(f"  1. Check GitHub for committed changes")
     print(f"  2. Update Kaggle dataset manually or via API")
     print(f"  3. Announce update on social media (optional)")
-    print(f"{'=' * 80}\n")
+    print(f"{SEPARATOR}\n")
+    
+    if committed:
+        print_banner("Pushing to GitHub...")
+        # Replace this process with git so the push's exit status becomes the script's
+        sys.stdout.flush()
+        try:
+            os.execvp(PUSH_COMMAND[0], PUSH_COMMAND)
+        except OSError as e:
+            print(f"⚠️  Could not push to GitHub ({e}). Push manually with: git push origin main")
 
 
 if __name__ == '__main__':